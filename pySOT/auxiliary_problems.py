@@ -16,6 +16,34 @@ from pySOT.utils import unit_rescale, round_vars
 from scipy.stats import norm
 
 
+def _min_dists(X, Y):
+    """Distance from each point in X to the closest point in Y.
+
+    We expand ||x - y||^2 = ||x||^2 - 2 x^T y + ||y||^2 so the pairwise
+    distances are computed with a single matrix product. The expansion
+    loses precision when the points are far from the origin, so we first
+    center both sets around the mean of Y. The matrix product is only used
+    to find the closest point in Y, the distance to it is then computed
+    directly so duplicate points have distance exactly zero.
+
+    :param X: Points, of size m x dim
+    :type X: numpy.array
+    :param Y: Points, of size n x dim
+    :type Y: numpy.array
+
+    :return: Minimum distances, of size m x 1
+    :rtype: numpy.array
+    """
+    center = np.mean(Y, axis=0)
+    X, Y = X - center, Y - center
+    dists = np.dot(X, Y.T)
+    dists *= -2.0
+    dists += np.einsum('ij,ij->i', Y, Y)
+    closest = np.argmin(dists, axis=1)  # ||x||^2 doesn't change the argmin
+    diff = X - Y[closest, :]
+    return np.sqrt(np.einsum('ij,ij->i', diff, diff))[:, np.newaxis]
+
+
 def weighted_distance_merit(num_pts, surrogate, X, fX, cand,
                             weights, Xpend=None, dtol=1e-3):
     """Compute the weighted distance merit function.
@@ -42,10 +70,9 @@ def weighted_distance_merit(num_pts, surrogate, X, fX, cand,
     """
     # Distance
     dim = X.shape[1]
-    if Xpend is None:  # cdist can't handle None arguments
+    if Xpend is None:  # vstack can't handle None arguments
         Xpend = np.empty([0, dim])
-    dists = scpspatial.distance.cdist(cand, np.vstack((X, Xpend)))
-    dmerit = np.amin(dists, axis=1, keepdims=True)
+    dmerit = _min_dists(cand, np.vstack((X, Xpend)))
 
     # Values
     fvals = surrogate.predict(cand)
@@ -102,7 +129,7 @@ def candidate_srbf(num_pts, opt_prob, surrogate, X, fX, weights,
     :rtype: numpy.array of size num_pts x dim
     """
     # Find best solution
-    xbest = np.copy(X[np.argmin(fX), :]).ravel()
+    xbest = X[np.argmin(fX), :]
 
     # Fix default values
     if num_cand is None:
@@ -118,7 +145,7 @@ def candidate_srbf(num_pts, opt_prob, surrogate, X, fX, weights,
         scalefactors[ind] = np.maximum(scalefactors[ind], 1.0)
 
     # Generate candidate points
-    cand = np.multiply(np.ones((num_cand,  opt_prob.dim)), xbest)
+    cand = np.full((num_cand, opt_prob.dim), xbest, dtype=np.float64)
     for i in subset:
         lower, upper, sigma = opt_prob.lb[i], opt_prob.ub[i], scalefactors[i]
         cand[:, i] = stats.truncnorm.rvs(
@@ -168,7 +195,7 @@ def candidate_dycors(num_pts, opt_prob, surrogate, X, fX, weights,
     :rtype: numpy.array of size num_pts x dim
     """
     # Find best solution
-    xbest = np.copy(X[np.argmin(fX), :]).ravel()
+    xbest = X[np.argmin(fX), :]
 
     # Fix default values
     if num_cand is None:
@@ -191,7 +218,7 @@ def candidate_dycors(num_pts, opt_prob, surrogate, X, fX, weights,
         ind = np.where(np.sum(ar, axis=1) == 0)[0]
         ar[ind, np.random.randint(0, len(subset) - 1, size=len(ind))] = 1
 
-    cand = np.multiply(np.ones((num_cand, opt_prob.dim)), xbest)
+    cand = np.full((num_cand, opt_prob.dim), xbest, dtype=np.float64)
     for i in subset:
         lower, upper, sigma = opt_prob.lb[i], opt_prob.ub[i], scalefactors[i]
         ind = np.where(ar[:, i] == 1)[0]
@@ -237,7 +264,7 @@ def candidate_uniform(num_pts, opt_prob, surrogate, X, fX, weights,
     :rtype: numpy.array of size num_pts x dim
     """
     # Find best solution
-    xbest = np.copy(X[np.argmin(fX), :]).ravel()
+    xbest = X[np.argmin(fX), :]
 
     # Fix default values
     if num_cand is None:
@@ -246,7 +273,7 @@ def candidate_uniform(num_pts, opt_prob, surrogate, X, fX, weights,
         subset = np.arange(0, opt_prob.dim)
 
     # Generate uniformly random candidate points
-    cand = np.multiply(np.ones((num_cand, opt_prob.dim)), xbest)
+    cand = np.full((num_cand, opt_prob.dim), xbest, dtype=np.float64)
     cand[:, subset] = np.random.uniform(
         opt_prob.lb[subset], opt_prob.ub[subset],
         (num_cand, len(subset)))
@@ -283,8 +310,7 @@ def ei_merit(X, surrogate, fX, XX=None, dtol=0):
     ei = sig * beta
 
     if dtol > 0:
-        dists = scpspatial.distance.cdist(X, XX)
-        dmerit = np.amin(dists, axis=1, keepdims=True)
+        dmerit = _min_dists(X, XX)
         ei[dmerit < dtol] = 0.0
 
     return ei
@@ -314,7 +340,7 @@ def expected_improvement_ga(num_pts, opt_prob, surrogate, X, fX,
     :return: num_pts new points to evaluate
     :rtype: numpy.array of size num_pts x dim
     """
-    if Xpend is None:  # cdist can't handle None arguments
+    if Xpend is None:  # vstack can't handle None arguments
         Xpend = np.empty([0, opt_prob.dim])
     XX = np.vstack((X, Xpend))
 
@@ -371,7 +397,7 @@ def expected_improvement_uniform(num_pts, opt_prob, surrogate, X, fX,
     """
     if num_cand is None:
         num_cand = 100*opt_prob.dim
-    if Xpend is None:  # cdist can't handle None arguments
+    if Xpend is None:  # vstack can't handle None arguments
         Xpend = np.empty([0, opt_prob.dim])
     XX = np.vstack((X, Xpend))
 
@@ -427,8 +453,7 @@ def lcb_merit(X, surrogate, fX, XX=None, dtol=0.0, kappa=2.0):
     lcb = mu - kappa * sig
 
     if dtol > 0:
-        dists = scpspatial.distance.cdist(X, XX)
-        dmerit = np.amin(dists, axis=1, keepdims=True)
+        dmerit = _min_dists(X, XX)
         lcb[dmerit < dtol] = np.inf
     return lcb
 
@@ -459,7 +484,7 @@ def lower_confidence_bound_ga(num_pts, opt_prob, surrogate, X, fX,
     :rtype: numpy.array of size num_pts x dim
     """
 
-    if Xpend is None:  # cdist can't handle None arguments
+    if Xpend is None:  # vstack can't handle None arguments
         Xpend = np.empty([0, opt_prob.dim])
     XX = np.vstack((X, Xpend))
 
@@ -11,75 +11,136 @@ from pySOT.optimization_problems import Sphere
 
 from poap.controller import ThreadController, ProcessWorkerThread
 import numpy as np
+import os
 import os.path
 import logging
+import logging.handlers
+import queue
 from subprocess import Popen, PIPE
 
 
-def array2str(x):
-    return ",".join(np.char.mod('%f', x.ravel()))
-
-
 # Find path of the executable
 path = os.path.dirname(os.path.abspath(__file__)) + "/sphere_ext"
+_PATH_OK = os.path.isfile(path)
 
 
 class CppSim(ProcessWorkerThread):
+    """Worker that keeps one sphere_ext process alive for all evaluations.
+
+    The process is started in binary mode (sphere_ext -b dim) so each input
+    is written to its stdin as dim raw doubles and the process answers with
+    one raw double, where NaN means that the evaluation crashed. This avoids
+    launching a new process and formatting/parsing strings per evaluation.
+
+    The input and output are passed through buffers that are allocated when
+    the process is started, so nothing is allocated per evaluation. Each
+    worker runs in its own thread, so the buffers are never shared. The pipes
+    are unbuffered so each evaluation is exactly one write and one read
+    system call, without copying through Python's I/O buffers.
+    """
+    def start_process(self, dim):
+        self.process = Popen([path, "-b", str(dim)], stdin=PIPE, stdout=PIPE,
+                             bufsize=0)
+        self.xbuf = np.empty(dim)
+        self.fbuf = np.empty(1)
+
     def handle_eval(self, record):
+        x = record.params[0]
         try:
-            self.process = Popen(
-                [path, array2str(record.params[0])],
-                stdout=PIPE, bufsize=1, universal_newlines=True)
-            val = self.process.communicate()[0]
-            self.finish_success(record, float(val))
-        except ValueError:
+            if self.process is None or self.process.poll() is not None:
+                self.start_process(len(x))  # Start or restart if needed
+            self.xbuf[:] = x
+            data = memoryview(self.xbuf).cast("B")
+            while data:  # Unbuffered writes may be partial
+                data = data[self.process.stdin.write(data):]
+            nbytes = self.process.stdout.readinto(self.fbuf)
+            if nbytes != self.fbuf.nbytes or np.isnan(self.fbuf[0]):
+                raise ValueError()
+            self.finish_success(record, float(self.fbuf[0]))
+        except (ValueError, OSError):
             self.finish_cancelled(record)
             logging.info("WARNING: Incorrect output or crashed evaluation")
 
+    def handle_terminate(self):
+        if self.process is not None:
+            self.process.stdin.close()
+            self.process.wait()
+
+
+class IdleBatchSRBFStrategy(SRBFStrategy):
+    """SRBF strategy that proposes points for all idle workers at once.
+
+    In asynchronous mode SRBFStrategy generates one point at a time, so when
+    several workers are idle we score the full set of candidate points once
+    per worker. Here we ask for as many points as there are idle workers in
+    a single call. The weighted distance merit updates the distances after
+    each selected point, which keeps the points in the batch apart.
+    """
+    def __init__(self, controller, **kwargs):
+        self.controller = controller
+        super().__init__(**kwargs)
+
+    def generate_evals(self, num_pts):
+        if self.asynchronous:
+            remaining = self.max_evals - self.num_evals - self.pending_evals
+            num_pts = max(num_pts, min(self.controller.workers.qsize(),
+                                       remaining))
+        super().generate_evals(num_pts=num_pts)
+
 
 def example_subprocess():
+    assert _PATH_OK, "You need to build sphere_ext"
+
     if not os.path.exists("./logfiles"):
         os.makedirs("logfiles")
-    if os.path.exists("./logfiles/example_subprocess.log"):
-        os.remove("./logfiles/example_subprocess.log")
-    logging.basicConfig(filename="./logfiles/example_subprocess.log",
-                        level=logging.INFO)
-
-    print("\nNumber of threads: 1")
-    print("Maximum number of evaluations: 200")
-    print("Search strategy: Candidate DYCORS")
-    print("Experimental design: Symmetric Latin Hypercube")
-    print("Surrogate: Cubic RBF")
-
-    assert os.path.isfile(path), "You need to build sphere_ext"
-
-    num_threads = 1
-    max_evals = 200
-
-    sphere = Sphere(dim=10)
-    rbf = RBFInterpolant(dim=sphere.dim, kernel=CubicKernel(),
-                         tail=LinearTail(sphere.dim))
-    slhd = SymmetricLatinHypercube(
-        dim=sphere.dim, num_pts=2*(sphere.dim+1))
-
-    # Create a strategy and a controller
-    controller = ThreadController()
-    controller.strategy = SRBFStrategy(
-        max_evals=max_evals, opt_prob=sphere, exp_design=slhd,
-        surrogate=rbf, asynchronous=True, batch_size=num_threads)
-
-    print("Number of threads: {}".format(num_threads))
-    print("Maximum number of evaluations: {}".format(max_evals))
-    print("Strategy: {}".format(controller.strategy.__class__.__name__))
-    print("Experimental design: {}".format(slhd.__class__.__name__))
-    print("Surrogate: {}".format(rbf.__class__.__name__))
-
-    # Launch the threads and give them access to the objective function
-    for _ in range(num_threads):
-        controller.launch_worker(CppSim(controller))
-
-    # Run the optimization strategy
-    result = controller.run()
+
+    # Write the log file from a background thread so the workers and the
+    # strategy only have to put the log records on a queue
+    log_queue = queue.Queue(-1)
+    file_handler = logging.FileHandler(
+        "./logfiles/example_subprocess.log", mode="w")  # Truncate old log
+    file_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(logging.INFO)
+    listener.start()
+
+    try:
+        num_threads = 4
+        max_evals = 200
+
+        sphere = Sphere(dim=10)
+        rbf = RBFInterpolant(dim=sphere.dim, kernel=CubicKernel(),
+                             tail=LinearTail(sphere.dim))
+        slhd = SymmetricLatinHypercube(
+            dim=sphere.dim, num_pts=2*(sphere.dim+1))
+
+        # Create a strategy and a controller
+        controller = ThreadController()
+        controller.strategy = IdleBatchSRBFStrategy(
+            controller=controller, max_evals=max_evals, opt_prob=sphere,
+            exp_design=slhd, surrogate=rbf, asynchronous=True,
+            batch_size=num_threads, num_cand=min(500, 100*sphere.dim))
+
+        print("\n".join([
+            "Number of threads: {}".format(num_threads),
+            "Maximum number of evaluations: {}".format(max_evals),
+            "Strategy: {}".format(controller.strategy.__class__.__name__),
+            "Experimental design: {}".format(slhd.__class__.__name__),
+            "Surrogate: {}".format(rbf.__class__.__name__)]))
+
+        # Launch the threads and give them access to the objective function
+        for _ in range(num_threads):
+            controller.launch_worker(CppSim(controller))
+
+        # Run the optimization strategy
+        result = controller.run()
+    finally:  # Detach from the root logger so repeated runs don't pile up
+        root.removeHandler(queue_handler)
+        listener.stop()
+        file_handler.close()
 
     print('Best value found: {0}'.format(result.value))
     print('Best solution found: {0}\n'.format(
@@ -0,0 +1,127 @@
+"""
+.. module:: example_subprocess_asyncio
+  :synopsis: Example of an external objective function driven by asyncio
+.. moduleauthor:: David Eriksson <dme65@cornell.edu>
+
+This example uses async def and asyncio.run_coroutine_threadsafe, so it
+requires Python 3.5.1 or newer and is skipped by the makefile otherwise.
+"""
+
+from pySOT.experimental_design import SymmetricLatinHypercube
+from pySOT.strategy import SRBFStrategy
+from pySOT.surrogate import RBFInterpolant, CubicKernel, LinearTail
+from pySOT.optimization_problems import Sphere
+
+from poap.controller import ThreadController
+import numpy as np
+import os.path
+import logging
+import asyncio
+import sys
+import threading
+
+
+def array2str(x):
+    return ",".join("%.17g" % v for v in x.ravel().tolist())
+
+
+# Find path of the executable
+path = os.path.dirname(os.path.abspath(__file__)) + "/sphere_ext"
+_PATH_OK = os.path.isfile(path)
+
+
+class AsyncCppSim(object):
+    """Worker that runs its evaluations on a shared asyncio event loop.
+
+    This is not a thread, so we can create one worker per concurrent
+    evaluation and have a single event loop thread drive all of the
+    sphere_ext processes. The worker implements the same eval/kill interface
+    as the POAP worker threads and reports back to the controller
+    through controller.add_message.
+    """
+    def __init__(self, controller, loop):
+        self.controller = controller
+        self.loop = loop
+        self.process = None
+
+    def eval(self, record):
+        self.controller.add_message(record.running)
+        asyncio.run_coroutine_threadsafe(self.handle_eval(record), self.loop)
+
+    def kill(self, record):
+        if self.process is not None and self.process.returncode is None:
+            self.loop.call_soon_threadsafe(self.process.terminate)
+
+    async def handle_eval(self, record):
+        # Any failure cancels the evaluation, otherwise this worker would
+        # never be returned to the controller and controller.run() hangs
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                path, array2str(record.params[0]),
+                stdout=asyncio.subprocess.PIPE)
+            val = float((await self.process.communicate())[0])
+            self.controller.add_message(lambda: record.complete(val))
+        except Exception:
+            self.controller.add_message(record.cancel)
+            logging.info("WARNING: Incorrect output or crashed evaluation")
+        self.controller.add_worker(self)
+
+
+def example_subprocess_asyncio():
+    if not os.path.exists("./logfiles"):
+        os.makedirs("logfiles")
+    if os.path.exists("./logfiles/example_subprocess_asyncio.log"):
+        os.remove("./logfiles/example_subprocess_asyncio.log")
+    logging.basicConfig(filename="./logfiles/example_subprocess_asyncio.log",
+                        level=logging.INFO)
+
+    assert _PATH_OK, "You need to build sphere_ext"
+
+    num_workers = 4
+    max_evals = 200
+
+    sphere = Sphere(dim=10)
+    rbf = RBFInterpolant(dim=sphere.dim, kernel=CubicKernel(),
+                         tail=LinearTail(sphere.dim))
+    slhd = SymmetricLatinHypercube(
+        dim=sphere.dim, num_pts=2*(sphere.dim+1))
+
+    # Create a strategy and a controller
+    controller = ThreadController()
+    controller.strategy = SRBFStrategy(
+        max_evals=max_evals, opt_prob=sphere, exp_design=slhd,
+        surrogate=rbf, asynchronous=True, batch_size=num_workers)
+
+    print("Number of workers: {}".format(num_workers))
+    print("Maximum number of evaluations: {}".format(max_evals))
+    print("Strategy: {}".format(controller.strategy.__class__.__name__))
+    print("Experimental design: {}".format(slhd.__class__.__name__))
+    print("Surrogate: {}".format(rbf.__class__.__name__))
+
+    # One thread runs the event loop that drives all the workers
+    loop = asyncio.new_event_loop()
+    if sys.version_info < (3, 8) and sys.platform != "win32":
+        # Before Python 3.8 the child watcher that reaps the sphere_ext
+        # processes must be attached to the loop from the main thread
+        asyncio.get_child_watcher().attach_loop(loop)
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    for _ in range(num_workers):
+        controller.add_worker(AsyncCppSim(controller, loop))
+
+    # Run the optimization strategy
+    try:
+        result = controller.run()
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    print('Best value found: {0}'.format(result.value))
+    print('Best solution found: {0}\n'.format(
+        np.array_str(result.params[0], max_line_width=np.inf,
+                     precision=5, suppress_small=True)))
+
+
+if __name__ == '__main__':
+    example_subprocess_asyncio()
@@ -32,9 +32,10 @@ class CppSim(ProcessWorkerThread):
             f.write(array2str(record.params[0]))
             f.close()
 
-            self.process = Popen([path, self.my_filename], stdout=PIPE,
-                                 bufsize=1, universal_newlines=True)
-            val = self.process.communicate()[0]
+            self.process = Popen([path, self.my_filename], stdout=PIPE)
+            with self.process.stdout:
+                val = self.process.stdout.read()
+            self.process.wait()
 
             self.finish_success(record, float(val))
             os.remove(self.my_filename)  # Remove input file
@@ -11,8 +11,10 @@ from pySOT.optimization_problems import Sphere
 
 from poap.mpiserve import MPIController, MPIProcessWorker
 import numpy as np
+import os
 import os.path
 import logging
+import signal
 from subprocess import Popen, PIPE
 
 # Try to import mpi4py
@@ -24,20 +26,72 @@ except Exception as err:
 
 
 def array2str(x):
-    return ",".join(np.char.mod('%f', x))
+    return ",".join("%.17g" % v for v in x.ravel().tolist())
 
 
 # Find path of the executable
 path = os.path.dirname(os.path.abspath(__file__)) + "/sphere_ext"
 
 
+class SpawnedProcess(object):
+    """Minimal Popen replacement that launches the process with posix_spawn.
+
+    Only stdout is captured. Unlike fork, posix_spawn does not duplicate the
+    page tables of the parent, which gets expensive once the parent holds
+    a large surrogate model. Provides the subset of the Popen interface
+    used by MPIProcessWorker (poll, wait, terminate).
+    """
+    def __init__(self, args):
+        rfd, wfd = os.pipe()
+        try:
+            self.pid = os.posix_spawn(
+                args[0], args, os.environ,
+                file_actions=[(os.POSIX_SPAWN_DUP2, wfd, 1)])
+        except BaseException:
+            os.close(rfd)
+            raise
+        finally:
+            os.close(wfd)
+        self.stdout = os.fdopen(rfd, 'rb')
+        self.returncode = None
+
+    def _set_returncode(self, status):
+        if os.WIFSIGNALED(status):
+            self.returncode = -os.WTERMSIG(status)
+        else:
+            self.returncode = os.WEXITSTATUS(status)
+
+    def poll(self):
+        if self.returncode is None:
+            pid, status = os.waitpid(self.pid, os.WNOHANG)
+            if pid != 0:
+                self._set_returncode(status)
+        return self.returncode
+
+    def wait(self):
+        if self.returncode is None:
+            self._set_returncode(os.waitpid(self.pid, 0)[1])
+        return self.returncode
+
+    def terminate(self):
+        if self.returncode is None:
+            os.kill(self.pid, signal.SIGTERM)
+
+
+def launch(args):
+    """Launch a process with its stdout piped, using posix_spawn if we can."""
+    if hasattr(os, "posix_spawn"):
+        return SpawnedProcess(args)
+    return Popen(args, stdout=PIPE)
+
+
 class CppSim(MPIProcessWorker):
     def eval(self, record_id, params, extra_args=None):
         try:
-            self.process = Popen([
-                path, array2str(params[0])], stdout=PIPE,
-                bufsize=1, universal_newlines=True)
-            val = self.process.communicate()[0]
+            self.process = launch([path, array2str(params[0])])
+            with self.process.stdout:
+                val = self.process.stdout.read()
+            self.process.wait()
             self.finish_success(record_id, float(val))
         except ValueError:
             logging.info("WARNING: Incorrect output or crashed evaluation")
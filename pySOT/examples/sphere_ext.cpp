@@ -1,40 +1,77 @@
 #include <iostream>
 #include <vector>
 #include <sstream>
+#include <string>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <limits>
 #include <unistd.h>
 #include <numeric>
 #include <random>
 
 /*
 Simple routine that takes an input of the form 'x1,x2,...,xn' and converts this
-input to a standard vector of floats. With probability 0.9 this routine computes
+input to a standard vector of doubles. With probability 0.9 this routine computes
 the sphere function (sum of square) of the input and prints it to the screen and
 with probability 0.1 the routine does nothing. This is meant to simulate an
 external objective function that randomly crashes and hence gives no meaningful
 output.
+
+The input is passed as a command line argument and we evaluate it once and exit.
+With the arguments '-b dim' we instead keep reading inputs from stdin as raw
+doubles, dim doubles per input, and write one double per input to stdout, where
+NaN signals a crashed evaluation. This allows the caller to keep a single
+process alive for many evaluations.
 */
 
-int main(int argc, char** argv) {
-	// Random number generator
-	std::random_device rand_dev;
-	std::mt19937 generator(rand_dev());
-	std::uniform_real_distribution<float>  distr(0.0, 1.0);
+// Random number generator
+std::random_device rand_dev;
+std::mt19937 generator(rand_dev());
+std::uniform_real_distribution<float>  distr(0.0, 1.0);
+
+// Pretend the simulation crashes with probability 0.1
+bool crashed() {
+	return distr(generator) <= 0.1;
+}
+
+double sphere(const std::vector<double>& vect) {
+	return std::inner_product(vect.begin(), vect.end(), vect.begin(), 0.0);
+}
 
-	// Pretend the simulation crashes with probability 0.1
-	if(distr(generator) > 0.1) {
+void sphere(const std::string& input) {
+	if(!crashed()) {
 
 		// Convert input to a standard vector
-		std::vector<float> vect;
-		std::stringstream ss(argv[1]);
-		float f;
+		std::vector<double> vect;
+		std::stringstream ss(input);
+		double f;
 
 		while (ss >> f) {
 			vect.push_back(f);
 			if (ss.peek() == ',')
 			ss.ignore();
 		}
-		printf("%g\n", std::inner_product(vect.begin(), vect.end(),
-		vect.begin(), 0.0 ));
+		printf("%.17g", sphere(vect));
 	}
+	printf("\n");
+}
+
+int main(int argc, char** argv) {
+	if(argc > 2 && strcmp(argv[1], "-b") == 0) {
+		size_t dim = atoi(argv[2]);
+		std::vector<double> vect(dim);
+		while (fread(vect.data(), sizeof(double), dim, stdin) == dim) {
+			double val = std::numeric_limits<double>::quiet_NaN();
+			if(!crashed())
+				val = sphere(vect);
+			fwrite(&val, sizeof(double), 1, stdout);
+			fflush(stdout);
+		}
+		return 0;
+	}
+
+	if(argc > 1)
+		sphere(argv[1]);
 	return 0;
 }
@@ -17,7 +17,7 @@ import six
 import itertools
 from pySOT.utils import from_unit_box, round_vars
 from numpy.linalg import matrix_rank as rank
-from scipy.spatial.distance import cdist
+from scipy.spatial.distance import pdist
 import warnings
 
 
@@ -65,9 +65,8 @@ def _expdes_dist(gen, iterations, lb, ub, int_var):
         if all([x is not None for x in [lb, ub]]):  # Map and round
             cand = round_vars(from_unit_box(cand, lb, ub), int_var, lb, ub)
 
-        dists = cdist(cand, cand)
-        np.fill_diagonal(dists, np.inf)  # Since these are zero
-        score = dists.min().min()
+        # Only the pairs of distinct points, a single point has no pairs
+        score = pdist(cand).min() if cand.shape[0] > 1 else np.inf
 
         if score > best_score and rank(cand) == cand.shape[1]:
             best_score = score
@@ -189,18 +188,17 @@ class SymmetricLatinHypercube(ExperimentalDesign):
         if self.num_pts % 2 == 1:
             points[middleind, :] = middleind + 1
 
-        # Generate the top half of the hypercube matrix
-        for j in range(1, self.dim):
-            for i in range(middleind):
-                if np.random.random() < 0.5:
-                    points[i, j] = self.num_pts - i
-                else:
-                    points[i, j] = i + 1
-            np.random.shuffle(points[:middleind, j])
+        # Generate the top half of the hypercube matrix. Row i is either
+        # i + 1 or num_pts - i and each column is shuffled independently
+        rows = np.arange(middleind)[:, np.newaxis]
+        flip = np.random.random((middleind, self.dim - 1)) < 0.5
+        top = np.where(flip, self.num_pts - rows, rows + 1)
+        perm = np.argsort(np.random.random(top.shape), axis=0)
+        points[:middleind, 1:] = np.take_along_axis(top, perm, axis=0)
 
         # Generate the bottom half of the hypercube matrix
-        for i in range(middleind, self.num_pts):
-            points[i, :] = self.num_pts + 1 - points[self.num_pts - 1 - i, :]
+        points[middleind:, :] = \
+            self.num_pts + 1 - points[self.num_pts - 1 - middleind::-1, :]
 
         return (points - 1) / (self.num_pts - 1)  # Map to [0, 1]^d
 
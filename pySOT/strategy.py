@@ -30,6 +30,13 @@ from pySOT.utils import check_opt_prob
 logger = logging.getLogger(__name__)
 
 
+def _grow_rows(A, num_rows):
+    """Pad A with uninitialized rows so it has at least num_rows rows."""
+    if A.shape[0] >= num_rows:
+        return A
+    return np.vstack((A, np.empty((num_rows - A.shape[0], A.shape[1]))))
+
+
 class RandomSampling(BaseStrategy):
     """Random sampling strategy.
 
@@ -144,6 +151,7 @@ class SurrogateBaseStrategy(BaseStrategy):
         self.terminate = False
         self.accepted_count = 0
         self.rejected_count = 0
+        self._rejected_point = None  # Rejected asynchronous proposal
 
         # Initial design info
         self.extra_points = extra_points
@@ -157,15 +165,24 @@ class SurrogateBaseStrategy(BaseStrategy):
         self.max_evals = max_evals     # Remaining feval budget
         self.pending_evals = 0         # Number of outstanding fevals
 
-        # Completed evaluations
-        self.X = np.empty([0, opt_prob.dim])
-        self.fX = np.empty([0, 1])
-        self.Xpend = np.empty([0, opt_prob.dim])
-        self.fevals = []
-
         # Check inputs (implemented by each strategy)
         self.check_input()
 
+        # Completed and pending evaluations. The points are stored in buffers
+        # that grow by doubling, see X, fX, Xpend. Completed points get room
+        # for the entire budget up front while only a handful of points are
+        # pending at any time, so Xpend starts small.
+        num_extra = 0 if extra_points is None else extra_points.shape[0]
+        self._X = np.empty([max_evals + num_extra, opt_prob.dim])
+        self._fX = np.empty([max_evals + num_extra, 1])
+        self._Xpend = np.empty([max(16, batch_size or 1), opt_prob.dim])
+        self._Xpend_diff = np.empty(self._Xpend.shape)  # Scratch space used
+        self._Xpend_dist = np.empty(self._Xpend.shape[0])  # by remove_pending
+        self._num_X = 0
+        self._num_Xpend = 0
+        self._num_surrogate = 0  # Number of points in X added to surrogate
+        self.fevals = []
+
         # Start with first experimental design
         self.sample_initial()
 
@@ -173,6 +190,52 @@ class SurrogateBaseStrategy(BaseStrategy):
     def generate_evals(self, num_pts):
         pass
 
+    @property
+    def X(self):
+        """Evaluated points, of size n x dim"""
+        return self._X[:self._num_X, :]
+
+    @property
+    def fX(self):
+        """Values at the evaluated points, of size n x 1"""
+        return self._fX[:self._num_X, :]
+
+    @property
+    def Xpend(self):
+        """Pending evaluations, of size k x dim"""
+        return self._Xpend[:self._num_Xpend, :]
+
+    def _add_point(self, xx, fx):
+        """Append an evaluated point to X and fX."""
+        if self._num_X == self._X.shape[0]:  # Only if we exceed the budget
+            self._X = _grow_rows(self._X, max(1, 2 * self._num_X))
+            self._fX = _grow_rows(self._fX, max(1, 2 * self._num_X))
+        self._X[self._num_X, :] = xx
+        self._fX[self._num_X, :] = fx
+        self._num_X += 1
+
+    def _add_pending(self, x):
+        """Append a pending point to Xpend."""
+        if self._num_Xpend == self._Xpend.shape[0]:
+            self._Xpend = _grow_rows(self._Xpend, max(1, 2 * self._num_Xpend))
+            self._Xpend_diff = np.empty(self._Xpend.shape)
+            self._Xpend_dist = np.empty(self._Xpend.shape[0])
+        self._Xpend[self._num_Xpend, :] = x
+        self._num_Xpend += 1
+
+    def _update_surrogate(self):
+        """Add the evaluated points the surrogate hasn't seen yet.
+
+        Completed evaluations are only stored in X and fX and are added to
+        the surrogate in a single call right before we need the surrogate,
+        so a batch of b points extends the surrogate once instead of b times.
+        """
+        if self._num_surrogate < self._num_X:
+            self.surrogate.add_points(
+                self.X[self._num_surrogate:, :],
+                self.fX[self._num_surrogate:, :])
+            self._num_surrogate = self._num_X
+
     def check_input(self):
         """Check the inputs to the optimization strategt. """
         if not isinstance(self.surrogate, Surrogate):
@@ -189,6 +252,28 @@ class SurrogateBaseStrategy(BaseStrategy):
                 self.max_evals >= self.exp_design.num_pts:
             raise ValueError("max_evals must be an integer >= exp_des.num_pts")
 
+    def __getstate__(self):
+        """Only pickle the used rows of the point buffers.
+
+        The scratch buffers of remove_pending are left out and the unused
+        rows of X, fX, and Xpend are added back in __setstate__.
+        """
+        state = self.__dict__.copy()
+        del state['_Xpend_diff'], state['_Xpend_dist']
+        state['_X'], state['_fX'] = self.X, self.fX
+        state['_Xpend'] = self.Xpend
+        state['_buffer_rows'] = (self._X.shape[0], self._Xpend.shape[0])
+        return state
+
+    def __setstate__(self, state):
+        num_rows, num_pend_rows = state.pop('_buffer_rows')
+        self.__dict__.update(state)
+        self._X = _grow_rows(self._X, num_rows)
+        self._fX = _grow_rows(self._fX, num_rows)
+        self._Xpend = _grow_rows(self._Xpend, num_pend_rows)
+        self._Xpend_diff = np.empty(self._Xpend.shape)
+        self._Xpend_dist = np.empty(self._Xpend.shape[0])
+
     def save(self, fname):
         """Save the state of the strategy.
 
@@ -214,7 +299,7 @@ class SurrogateBaseStrategy(BaseStrategy):
 
         # Remove everything that is pending
         self.pending_evals = 0
-        self.Xpend = np.empty([0, self.opt_prob.dim])
+        self._num_Xpend = 0
 
     def log_completion(self, record):
         """Record a completed evaluation to the log.
@@ -222,16 +307,18 @@ class SurrogateBaseStrategy(BaseStrategy):
         :param record: Record of the function evaluation
         :type record: EvalRecord
         """
+        if not logger.isEnabledFor(logging.INFO):  # Skip formatting the point
+            return
         xstr = np.array_str(
             record.params[0], max_line_width=np.inf,
             precision=5, suppress_small=True)
-        logger.info("{} {:.3e} @ {}".format(
-            self.num_evals, record.value, xstr))
+        logger.info("%d %.3e @ %s", self.num_evals, record.value, xstr)
 
     def sample_initial(self):
         """Generate and queue an initial experimental design."""
         logger.info("=== Start ===")
         self.surrogate.reset()
+        self._num_surrogate = self._num_X
 
         # NB: Experimental designs can now handle the mapping
         start_sample = self.exp_design.generate_points(
@@ -240,19 +327,16 @@ class SurrogateBaseStrategy(BaseStrategy):
         assert start_sample.shape[1] == self.opt_prob.dim, \
             "Dimension mismatch between problem and experimental design"
 
-        for j in range(self.exp_design.num_pts):
-            self.batch_queue.append(start_sample[j, :])
+        self.batch_queue.extend(start_sample[:self.exp_design.num_pts, :])
 
         if self.extra_points is not None:
             for i in range(self.extra_points.shape[0]):
                 if self.extra_vals is None or \
                         np.all(np.isnan(self.extra_vals[i])):  # Unknown value
                     self.batch_queue.append(self.extra_points[i, :])
-                else:  # Known value, save point and add to surrogate model
-                    x = np.copy(self.extra_points[i, :])
-                    self.X = np.vstack((self.X, x))
-                    self.fX = np.vstack((self.fX, self.extra_vals[i]))
-                    self.surrogate.add_points(x, self.extra_vals[i])
+                else:  # Known value, save point for the surrogate model
+                    self._add_point(self.extra_points[i, :],
+                                    self.extra_vals[i])
 
     def propose_action(self):
         """Propose an action.
@@ -264,10 +348,12 @@ class SurrogateBaseStrategy(BaseStrategy):
         """
         if self.terminate:  # Check if termination has been triggered
             if self.pending_evals == 0:
+                self._update_surrogate()
                 return Proposal('terminate')
         elif self.num_evals + self.pending_evals >= self.max_evals or \
                 self.terminate:
             if self.pending_evals == 0:  # Only terminate if nothing is pending
+                self._update_surrogate()
                 return Proposal('terminate')
         elif self.batch_queue:  # Propose point from the batch_queue
             if self.phase == 1:
@@ -277,8 +363,17 @@ class SurrogateBaseStrategy(BaseStrategy):
         else:  # Make new proposal in the adaptive phase
             self.phase = 2
             if self.asynchronous:  # Always make proposal with asynchrony
-                self.generate_evals(num_pts=1)
+                if self._rejected_point is not None and \
+                        self._rejected_point[1] == self._num_X:
+                    # Nothing has completed since the point was rejected
+                    # so the surrogate is unchanged and we can reuse it
+                    self.batch_queue.append(self._rejected_point[0])
+                else:
+                    self._update_surrogate()
+                    self.generate_evals(num_pts=1)
+                self._rejected_point = None
             elif self.pending_evals == 0:  # Make sure the entire batch is done
+                self._update_surrogate()
                 self.generate_evals(num_pts=self.batch_size)
 
             if self.terminate:  # Check if termination has been triggered
@@ -292,13 +387,26 @@ class SurrogateBaseStrategy(BaseStrategy):
         """Create proposal and update counters and budgets."""
         proposal = Proposal('eval', x)
         self.pending_evals += 1
-        self.Xpend = np.vstack((self.Xpend, np.copy(x)))
+        self._add_pending(x)
         return proposal
 
     def remove_pending(self, x):
-        """Delete a pending point from self.Xpend."""
-        idx = np.where((self.Xpend == x).all(axis=1))[0]
-        self.Xpend = np.delete(self.Xpend, idx, axis=0)
+        """Delete a pending point from self.Xpend.
+
+        We remove the closest pending point if it is within a squared
+        distance of 1e-20 from x and replace it by the last pending point,
+        so no other rows have to be moved. The distances are computed in
+        scratch buffers, so this doesn't allocate any temporary arrays.
+        """
+        n = self._num_Xpend
+        if n == 0:
+            return
+        diff = np.subtract(self.Xpend, x, out=self._Xpend_diff[:n, :])
+        dists = np.einsum('ij,ij->i', diff, diff, out=self._Xpend_dist[:n])
+        idx = np.argmin(dists)
+        if dists[idx] <= 1e-20:
+            self._num_Xpend -= 1
+            self._Xpend[idx, :] = self._Xpend[self._num_Xpend, :]
 
     # == Processing in initial phase ==
 
@@ -326,7 +434,6 @@ class SurrogateBaseStrategy(BaseStrategy):
         self.pending_evals -= 1
         xx = proposal.args[0]
         self.batch_queue.append(xx)  # Add back to queue
-        self.Xpend = np.vstack((self.Xpend, np.copy(xx)))
         self.remove_pending(xx)
 
     def on_initial_update(self, record):
@@ -341,11 +448,8 @@ class SurrogateBaseStrategy(BaseStrategy):
         self.num_evals += 1
         self.pending_evals -= 1
 
-        xx, fx = np.copy(record.params[0]), record.value
-        self.X = np.vstack((self.X, np.atleast_2d(xx)))
-        self.fX = np.vstack((self.fX, fx))
-
-        self.surrogate.add_points(xx, fx)
+        xx, fx = record.params[0], record.value
+        self._add_point(xx, fx)
         self.remove_pending(xx)
 
         self.log_completion(record)
@@ -384,10 +488,12 @@ class SurrogateBaseStrategy(BaseStrategy):
         """Handle rejected proposal from sampling phase."""
         self.rejected_count += 1
         self.pending_evals -= 1
-        xx = np.copy(proposal.args[0])
+        xx = proposal.args[0]
         self.remove_pending(xx)
         if not self.asynchronous:  # Add back to the queue in synchronous case
             self.batch_queue.append(xx)
+        else:  # Keep the point until the surrogate changes
+            self._rejected_point = (xx, self._num_X)
 
     def on_adapt_update(self, record):
         """Handle update of feval from sampling phase."""
@@ -401,10 +507,8 @@ class SurrogateBaseStrategy(BaseStrategy):
         self.num_evals += 1
         self.pending_evals -= 1
 
-        xx, fx = np.copy(record.params[0]), record.value
-        self.X = np.vstack((self.X, np.atleast_2d(xx)))
-        self.fX = np.vstack((self.fX, fx))
-        self.surrogate.add_points(xx, fx)
+        xx, fx = record.params[0], record.value
+        self._add_point(xx, fx)
         self.remove_pending(xx)
 
         self.log_completion(record)
@@ -413,7 +517,7 @@ class SurrogateBaseStrategy(BaseStrategy):
     def on_adapt_aborted(self, record):
         """Handle aborted feval from sampling phase."""
         self.pending_evals -= 1
-        xx = np.copy(record.params[0])
+        xx = record.params[0]
         self.remove_pending(xx)
         self.fevals.append(record)
 
@@ -562,8 +666,7 @@ class SRBFStrategy(SurrogateBaseStrategy):
             X=self.X, fX=self.fX, Xpend=self.Xpend, weights=weights,
             sampling_radius=self.sampling_radius, num_cand=self.num_cand)
 
-        for i in range(num_pts):
-            self.batch_queue.append(np.copy(np.ravel(new_points[i, :])))
+        self.batch_queue.extend(new_points[:num_pts, :])
 
     def adjust_step(self):
         """Adjust the sampling radius sigma.
@@ -671,8 +774,7 @@ class DYCORSStrategy(SRBFStrategy):
             num_cand=self.num_cand, sampling_radius=self.sampling_radius,
             prob_perturb=prob_perturb)
 
-        for i in range(num_pts):
-            self.batch_queue.append(np.copy(np.ravel(new_points[i, :])))
+        self.batch_queue.extend(new_points[:num_pts, :])
 
 
 class EIStrategy(SurrogateBaseStrategy):
@@ -758,8 +860,7 @@ class EIStrategy(SurrogateBaseStrategy):
         if new_points is None:  # Not enough improvement
             self.terminate = True
         else:
-            for i in range(num_pts):
-                self.batch_queue.append(np.copy(np.ravel(new_points[i, :])))
+            self.batch_queue.extend(new_points[:num_pts, :])
 
 
 class LCBStrategy(SurrogateBaseStrategy):
@@ -848,5 +949,4 @@ class LCBStrategy(SurrogateBaseStrategy):
         if new_points is None:  # Not enough improvement
             self.terminate = True
         else:
-            for i in range(num_pts):
-                self.batch_queue.append(np.copy(np.ravel(new_points[i, :])))
+            self.batch_queue.extend(new_points[:num_pts, :])
@@ -18,7 +18,6 @@ from sklearn.gaussian_process.kernels import RBF, WhiteKernel, ConstantKernel
 from sklearn.preprocessing import PolynomialFeatures
 from sklearn.pipeline import make_pipeline
 from sklearn.linear_model import Ridge
-from pySOT.utils import to_unit_box
 import warnings
 
 
@@ -186,7 +185,7 @@ class CubicKernel(Kernel):
             :math:`\\|x_i - x_j \\|^3`
         :rtype: numpy.array
         """
-        return dists ** 3
+        return dists * dists * dists  # Much faster than dists ** 3
 
     def deriv(self, dists):
         """Evaluates the derivative of the Cubic kernel for a distance matrix.
@@ -435,6 +434,16 @@ class RBFInterpolant(Surrogate):
         self.piv = None
         self.c = None
 
+    def __getstate__(self):
+        """Leave out the factorization when pickling the RBF interpolant.
+
+        The LU factors are of size (num_pts + ntail) x (num_pts + ntail) and
+        make up most of a checkpoint, so we refit the RBF after unpickling.
+        """
+        state = self.__dict__.copy()
+        state.update(L=None, U=None, piv=None, c=None, updated=False)
+        return state
+
     def _fit(self):
         """Compute new coefficients if the RBF is not updated.
 
@@ -483,19 +492,16 @@ class RBFInterpolant(Surrogate):
                                   self.kernel.eval(D[:k, :])))
                 Phinew = self.kernel.eval(D[k:, :]) + self.eta * np.eye(numnew)
 
-                L21 = np.zeros((kact, numnew))
-                U12 = np.zeros((kact, numnew))
-                for i in range(numnew):  # TODO: Can we use level-3 BLAS?
-                    L21[:, i] = scplinalg.solve_triangular(
-                        a=self.U, b=Pnew[:kact, i], lower=False, trans='T')
-                    U12[:, i] = scplinalg.solve_triangular(
-                        a=self.L, b=Pnew[self.piv[:kact], i],
-                        lower=True, trans='N')
-                L21 = L21.T
+                # Solve for all new columns at once (level-3 BLAS)
+                L21 = scplinalg.solve_triangular(
+                    a=self.U, b=Pnew[:kact, :], lower=False, trans='T').T
+                U12 = scplinalg.solve_triangular(
+                    a=self.L, b=Pnew[self.piv[:kact], :],
+                    lower=True, trans='N')
                 try:  # Compute Cholesky factorization of the Schur complement
                     C = scplinalg.cholesky(
                         a=Phinew - np.dot(L21, U12), lower=True)
-                finally:  # Compute a new LU factorization if Cholesky fails
+                except scplinalg.LinAlgError:  # Compute a new LU factorization
                     self.c = None
                     return self._fit()
 
@@ -892,8 +898,13 @@ class SurrogateUnitBox(Surrogate):
 
         assert(isinstance(model, Surrogate))
         self.model = model
-        self.lb = lb
-        self.ub = ub
+        self.lb = np.asarray(lb, dtype=np.float64)
+        self.ub = np.asarray(ub, dtype=np.float64)
+        self._scale = self.ub - self.lb  # Computed once for all predictions
+
+    def _to_unit_box(self, xx):
+        """Map points to the unit box using the precomputed scale."""
+        return (xx - self.lb) / self._scale
 
     def reset(self):
         """Reset the surrogate model."""
@@ -913,7 +924,7 @@ class SurrogateUnitBox(Surrogate):
         """
         super().add_points(xx, fx)
         self.model.add_points(
-            to_unit_box(xx, self.lb, self.ub), fx)
+            self._to_unit_box(xx), fx)
 
     def predict(self, xx):
         """Evaluate the surrogate model at the points xx
@@ -925,7 +936,7 @@ class SurrogateUnitBox(Surrogate):
         :rtype: numpy.ndarray
         """
         return self.model.predict(
-            to_unit_box(xx, self.lb, self.ub))
+            self._to_unit_box(xx))
 
     def predict_std(self, x):
         """Predict standard deviation at points xx.
@@ -937,7 +948,7 @@ class SurrogateUnitBox(Surrogate):
         :rtype: numpy.ndarray
         """
         return self.model.predict_std(
-            to_unit_box(x, self.lb, self.ub))
+            self._to_unit_box(x))
 
     def predict_deriv(self, x):
         """Evaluate the derivative of the surrogate model at points xx
@@ -952,4 +963,4 @@ class SurrogateUnitBox(Surrogate):
         :rtype: numpy.array
         """
         return self.model.predict_deriv(
-            to_unit_box(x, self.lb, self.ub)) / (self.ub - self.lb)
+            self._to_unit_box(x)) / self._scale
@@ -1,8 +1,9 @@
 from pySOT.auxiliary_problems import candidate_srbf, candidate_uniform, \
-    expected_improvement_ga, expected_improvement_uniform
+    expected_improvement_ga, expected_improvement_uniform, _min_dists
 from pySOT.surrogate import GPRegressor
 from pySOT.optimization_problems import Ackley
 import numpy as np
+import scipy.spatial as scpspatial
 
 
 def test_srbf():
@@ -77,6 +78,20 @@ def test_ei():
     assert np.isclose(x_next, x_true, atol=1e-2)
 
 
+def test_min_dists():
+    np.random.seed(0)
+    for offset in [0.0, 1e5]:
+        Y = offset + 10 * np.random.rand(50, 5)
+        X = np.vstack((Y[:10, :], offset + 10 * np.random.rand(100, 5)))
+        dists = _min_dists(X, Y)
+        dists_true = np.amin(
+            scpspatial.distance.cdist(X, Y), axis=1, keepdims=True)
+        assert dists.shape == (110, 1)
+        assert np.all(dists[:10] == 0.0)  # Exact duplicates
+        assert np.allclose(dists, dists_true, rtol=1e-10, atol=1e-10)
+
+
 if __name__ == '__main__':
+    test_min_dists()
     test_ei()
     test_srbf()
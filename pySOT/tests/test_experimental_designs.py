@@ -12,6 +12,11 @@ def test_lhd():
     assert lhd.num_pts == 10
     assert lhd.dim == 4
 
+    # A single point has no pairwise distances
+    lhd = LatinHypercube(dim=1, num_pts=1)
+    X = lhd.generate_points()
+    assert np.all(X.shape == (1, 1))
+
 
 def test_lhd_round():
     num_pts = 10
@@ -38,6 +43,12 @@ def test_slhd():
         assert slhd.num_pts == i
         assert slhd.dim == 3
 
+        # Each column is a permutation of 1, ..., n and the design is
+        # symmetric around the center
+        P = np.round(slhd._slhd() * (i - 1) + 1)
+        assert np.all(np.sort(P, axis=0) == np.arange(1, i + 1)[:, None])
+        assert np.all(P + P[::-1, :] == i + 1)
+
 
 def test_slhd_round():
     num_pts = 10
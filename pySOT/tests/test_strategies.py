@@ -106,6 +106,60 @@ def test_srbf_async():
     check_strategy(controller)
 
 
+def test_srbf_async_reject():
+    """Reuse a rejected proposal until an evaluation completes."""
+
+    class CountingSRBF(SRBFStrategy):
+        num_searches = 0  # Number of candidate searches
+
+        def generate_evals(self, num_pts):
+            self.num_searches += 1
+            super().generate_evals(num_pts)
+
+    def accept(proposal):
+        proposal.record = controller.new_feval(proposal.args)
+        proposal.accept()
+        return proposal.record
+
+    max_evals = 50
+    rbf = RBFInterpolant(
+        dim=ackley.dim, kernel=CubicKernel(),
+        tail=LinearTail(ackley.dim))
+    slhd = SymmetricLatinHypercube(
+        dim=ackley.dim, num_pts=2*(ackley.dim+1))
+
+    # Drive the strategy by hand so we can reject proposals
+    controller = SerialController(ackley.eval)
+    controller.strategy = CountingSRBF(
+        max_evals=max_evals, opt_prob=ackley, exp_design=slhd,
+        surrogate=rbf, asynchronous=True)
+    strategy = controller.strategy
+    for _ in range(slhd.num_pts):
+        record = accept(strategy.propose_action())
+        record.complete(ackley.eval(record.params[0]))
+    assert strategy.num_searches == 0
+
+    # Nothing has completed so the rejected point is proposed again
+    proposal = strategy.propose_action()
+    x = np.copy(proposal.args[0])
+    proposal.reject()
+    proposal = strategy.propose_action()
+    assert strategy.num_searches == 1
+    assert np.all(proposal.args[0] == x)
+    running = accept(proposal)
+
+    # An evaluation completes after the rejection so we search again
+    strategy.propose_action().reject()
+    assert strategy.num_searches == 2
+    running.complete(ackley.eval(running.params[0]))
+    record = accept(strategy.propose_action())
+    assert strategy.num_searches == 3
+    assert strategy.rejected_count == 2
+    assert strategy.Xpend.shape == (1, ackley.dim)
+    record.complete(ackley.eval(record.params[0]))
+    assert strategy.X.shape == (slhd.num_pts + 2, ackley.dim)
+
+
 #######################################################################
 
 
@@ -311,6 +365,7 @@ if __name__ == '__main__':
     test_srbf_serial()
     test_srbf_sync()
     test_srbf_async()
+    test_srbf_async_reject()
 
     test_dycors_serial()
     test_dycors_sync()
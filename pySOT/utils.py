@@ -76,14 +76,10 @@ def round_vars(x, int_var, lb, ub):
     """
 
     if len(int_var) > 0:
-        # Round the original ranged integer variables
-        x[:, int_var] = np.round(x[:, int_var])
-        # Make sure we don't violate the bound constraints
-        for i in int_var:
-            ind = np.where(x[:, i] < lb[i])
-            x[ind, i] = lb[i]
-            ind = np.where(x[:, i] > ub[i])
-            x[ind, i] = ub[i]
+        # Round the original ranged integer variables and make sure we don't
+        # violate the bound constraints, for all integer variables at once
+        x[:, int_var] = np.clip(
+            np.round(x[:, int_var]), lb[int_var], ub[int_var])
     return x
 
 